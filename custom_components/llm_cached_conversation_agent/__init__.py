@@ -1,8 +1,11 @@
 """LLM Cached Conversation Agent integration."""
 from __future__ import annotations
 
+from collections import ChainMap
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant
 
 from homeassistant.components.conversation.agent_manager import get_agent_manager
 
@@ -12,8 +15,8 @@ DOMAIN = "llm_cached_conversation_agent"
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    # Merge data + options (options override data)
-    merged = {**entry.data, **entry.options}
+    # Merge data + options (options override data) without copying either
+    merged = ChainMap(entry.options, entry.data)
     agent = LLMCachedAgent(hass, merged)
     manager = get_agent_manager(hass)
     manager.async_set_agent(entry.entry_id, agent)
@@ -21,6 +24,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = agent
     # Listen for options updates
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    async def _async_flush_on_stop(event: Event) -> None:
+        # Write answers still waiting in the debounce window and make them
+        # durable before shutdown
+        await agent.async_flush(durable=True)
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_flush_on_stop)
+    )
     return True
 
 
@@ -30,7 +42,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Cleanup stored agent reference
     domain_data = hass.data.get(DOMAIN)
     if isinstance(domain_data, dict):
-        domain_data.pop(entry.entry_id, None)
+        agent: LLMCachedAgent | None = domain_data.pop(entry.entry_id, None)
+        if agent is not None:
+            await agent.async_will_remove()
     return True
 
 
@@ -40,5 +54,5 @@ async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> Non
     agent: LLMCachedAgent | None = domain_data.get(entry.entry_id)
     if agent is None:
         return
-    merged = {**entry.data, **entry.options}
+    merged = ChainMap(entry.options, entry.data)
     await agent.async_update_config(merged)
@@ -2,72 +2,334 @@
 from __future__ import annotations
 
 import asyncio
+import base64
 import json
+import mmap
 import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime, timezone, tzinfo
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from zoneinfo import ZoneInfo
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.components.conversation.models import (
     AbstractConversationAgent,
     ConversationInput,
     ConversationResult,
 )
 from homeassistant.helpers import intent
+from homeassistant.util.async_ import run_callback_threadsafe
 
+if TYPE_CHECKING:
+    import aiohttp
 
-@dataclass
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+try:  # orjson ships with Home Assistant; the stdlib keeps other installs working
+    import orjson
+except ImportError:  # pragma: no cover - depends on the HA install
+    orjson = None  # type: ignore[assignment]
+
+try:  # numpy is optional: semantic lookup is disabled without it
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the HA install
+    np = None  # type: ignore[assignment]
+
+# How long the writer waits for more records before writing a batch, so a
+# burst of answers/alias updates lands in the journal with a single fsync.
+_FLUSH_DELAY = 5.0
+
+# Snapshot format version. Bumped whenever normalize() changes, so keys of an
+# older snapshot are re-normalized once on load (see _renormalize).
+_CACHE_VERSION = 3
+
+# Snapshots larger than this are parsed one item (line) at a time, so the
+# whole list of parsed dicts never has to sit in memory next to the cache
+_STREAM_THRESHOLD = 8 * 1024 * 1024
+_SNAPSHOT_HEAD_RE = re.compile(rb'\{"version":(\d+),"items":\[')
+
+
+@dataclass(slots=True)
 class CacheItem:
     q: str
     q_norm: str
     a: str
-    ts: str
+    # Creation time as epoch seconds; formatted as ISO-8601 only when
+    # persisted. 0.0 when unknown (missing/unparseable ts), never expires.
+    ts: float
     # List of alternate normalized forms (keeps variants like with/without punctuation)
     aliases: list[str] = field(default_factory=list)
+    # Base64 float16 embedding of the question (empty when not embedded)
+    emb: str = ""
+    # Punctuation-stripped q_norm and aliases, kept in memory only (not
+    # persisted) so index maintenance never re-strips stored forms
+    stripped: str = ""
+    stripped_aliases: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the on-disk representation (slots instances have no __dict__)."""
+        return {
+            "q": self.q,
+            "q_norm": self.q_norm,
+            "a": self.a,
+            "ts": _format_ts(self.ts),
+            "aliases": self.aliases,
+            "emb": self.emb,
+        }
+
+
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:  # pragma: no cover - depends on the HA install
+
+    def _json_loads(data: Any) -> Any:
+        # json.loads accepts bytes/str but not the memoryviews used for mmap
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+_WS_RE = re.compile(r"\s+")
+# Anything that is neither alphanumeric nor whitespace. \w also matches "_",
+# which str.isalnum() rejects, so it is listed explicitly.
+_PUNCT_RE = re.compile(r"[^\w\s]|_")
+# The same set restricted to ASCII, for the bytes.translate fast path
+_DROP_ASCII = bytes(i for i in range(128) if not (chr(i).isalnum() or chr(i).isspace()))
+# Bound once; built for every answer
+_IntentResponse = intent.IntentResponse
+
+
+def _parse_ts(ts: str) -> float:
+    try:
+        return datetime.fromisoformat(ts).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _format_ts(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts else ""
+
+
+def _item_from_dict(item: dict[str, Any]) -> CacheItem:
+    return CacheItem(
+        q=item.get("q", ""),
+        # Interned so lookups with an interned query compare by identity
+        q_norm=sys.intern(item.get("q_norm", "")),
+        a=item.get("a", ""),
+        ts=_parse_ts(item.get("ts", "")),
+        aliases=item.get("aliases", []) or [],
+        emb=item.get("emb", "") or "",
+    )
+
+
+def _dump_snapshot(items: list[dict[str, Any]], version: int = _CACHE_VERSION) -> bytes:
+    """Serialize a snapshot with one item per line.
+
+    The result is still one JSON document, but this layout lets large files
+    be read back line by line (see LLMCachedAgent._stream_snapshot).
+    """
+    head = b'{"version":%d,"items":[\n' % version
+    return head + b",\n".join(map(_json_dumps, items)) + b"\n]}\n"
+
+
+def _speech_result(user_input: ConversationInput, speech: str) -> ConversationResult:
+    """Build the result for a spoken answer.
+
+    A fresh IntentResponse is created per call on purpose: the conversation
+    pipeline keeps (and may mutate) the response after async_process
+    returns, so instances cannot be shared or pooled across turns.
+    """
+    resp = _IntentResponse(language=user_input.language)
+    resp.async_set_speech(speech)
+    return ConversationResult(response=resp, conversation_id=user_input.conversation_id)
+
+
+async def _finish(fut: asyncio.Future[Any]) -> Any:
+    """Await an executor job to completion, even if the caller is cancelled.
+
+    The job keeps running on its thread regardless; returning early would let
+    another file operation start alongside it. A cancellation received while
+    waiting is re-raised once the job is done.
+    """
+    cancelled = False
+    while not fut.done():
+        try:
+            await asyncio.wait((fut,))
+        except asyncio.CancelledError:
+            cancelled = True
+    if cancelled:
+        raise asyncio.CancelledError
+    return fut.result()
+
+
+def _fsync(fd: int) -> None:
+    """Flush fd to stable storage (F_FULLFSYNC on macOS, where fsync is weaker)."""
+    full_fsync = getattr(fcntl, "F_FULLFSYNC", None) if fcntl is not None else None
+    if full_fsync is not None:
+        try:
+            fcntl.fcntl(fd, full_fsync)
+            return
+        except OSError:
+            pass
+    os.fsync(fd)
+
+
+def _fsync_dir(path: Path) -> None:
+    """Make a rename/creation inside path durable (POSIX only, best-effort)."""
+    if os.name != "posix":
+        return
+    try:
+        dir_fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
 
 
 def normalize(text: str) -> str:
-    return " ".join(text.strip().lower().split())
+    # NFKC folds fullwidth forms, ligatures and decomposed accents into one
+    # spelling; the quick check makes already-normalized text nearly free
+    if not unicodedata.is_normalized("NFKC", text):
+        text = unicodedata.normalize("NFKC", text)
+    # casefold() also matches e.g. "ß"/"ss" and final sigma, unlike lower();
+    # in rare cases its output needs NFKC again
+    text = text.strip().casefold()
+    if not text.isascii() and not unicodedata.is_normalized("NFKC", text):
+        text = unicodedata.normalize("NFKC", text)
+    # One C-level regex pass instead of building a list with split()
+    return _WS_RE.sub(" ", text)
+
+
+@lru_cache(maxsize=2048)
+def _normalize_cached(text: str) -> str:
+    """Memoized, interned normalize() for repeated utterances."""
+    return sys.intern(normalize(text))
 
 
 def _strip_punctuation(text: str) -> str:
     """Return text without punctuation (keeps letters, numbers and spaces)."""
+    if text.isascii():
+        # Most queries are ASCII: a C-level byte filter beats the regex
+        return text.encode("ascii").translate(None, _DROP_ASCII).decode("ascii")
     # Keep unicode alphanumeric characters and whitespace
-    return "".join(ch for ch in text if ch.isalnum() or ch.isspace())
+    return _PUNCT_RE.sub("", text)
+
+
+def _encode_embedding(vec: Any) -> str:
+    """Encode a float vector as base64 float16 (half the size of float32)."""
+    return base64.b64encode(np.asarray(vec, dtype=np.float16).tobytes()).decode("ascii")
+
+
+def _decode_embedding(text: str) -> Any:
+    """Decode a base64 float16 embedding into a float32 vector."""
+    return np.frombuffer(base64.b64decode(text), dtype=np.float16).astype(np.float32)
+
+
+class _EmbeddingIndex:
+    """Contiguous [N, D] matrix of L2-normalized question embeddings.
+
+    Rows are kept in a single preallocated float32 matrix (grown by doubling)
+    so a lookup is one matrix-vector product instead of N small dot products.
+    """
+
+    def __init__(self) -> None:
+        self._keys: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._matrix: Any = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, key: str, vec: Any) -> None:
+        row = self._rows.get(key)
+        if row is not None and vec.shape[0] == self._matrix.shape[1]:
+            self._matrix[row] = vec
+            return
+        if self._matrix is None or vec.shape[0] != self._matrix.shape[1]:
+            # First row, or the embedding model changed dimension: start over
+            self._keys = []
+            self._rows = {}
+            self._matrix = np.empty((64, vec.shape[0]), dtype=np.float32)
+            self._size = 0
+        elif self._size == self._matrix.shape[0]:
+            self._matrix = np.concatenate((self._matrix, np.empty_like(self._matrix)))
+        self._matrix[self._size] = vec
+        self._keys.append(key)
+        self._rows[key] = self._size
+        self._size += 1
+
+    def remove(self, key: str) -> None:
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        last = self._size - 1
+        if row != last:
+            # Move the last row into the freed slot to keep the matrix dense
+            moved = self._keys[last]
+            self._matrix[row] = self._matrix[last]
+            self._keys[row] = moved
+            self._rows[moved] = row
+        self._keys.pop()
+        self._size = last
+
+    def best(self, vec: Any) -> tuple[str | None, float]:
+        """Return the key with the highest cosine similarity to vec."""
+        if not self._size or vec.shape[0] != self._matrix.shape[1]:
+            return None, 0.0
+        sims = self._matrix[: self._size] @ vec
+        idx = int(np.argmax(sims))
+        return self._keys[idx], float(sims[idx])
 
 
 class LLMCachedAgent(AbstractConversationAgent):
     """Conversation agent with file cache and LLM fallback via Ollama."""
 
-    def __init__(self, hass: HomeAssistant, config: dict[str, Any]) -> None:
+    def __init__(self, hass: HomeAssistant, config: Mapping[str, Any]) -> None:
         self.hass = hass
         self.config = config
-        self._cache: dict[str, CacheItem] = {}
+        # Insertion/recency ordered: the first entry is the least recently used
+        self._cache: OrderedDict[str, CacheItem] = OrderedDict()
+        # Held briefly where the event loop and the writer's executor thread
+        # both touch the cache: inserts/removals on the loop and copying it
+        # for compaction. A loaded cache and its indexes are swapped in on
+        # the event loop (see _swap_cache), so lookups there stay lock-free.
+        self._cache_lock = threading.Lock()
+        # Records/bytes appended to the journal since the last compaction,
+        # and the size of the snapshot it will be folded into
+        self._appended_count = 0
+        self._journal_bytes = 0
+        self._snapshot_bytes = 0
+        # fsync every write; off by default since the cache can be rebuilt and
+        # fsync dominates write latency on SD cards (synced once on shutdown)
+        self._durable_writes: bool = bool(config.get("durable_writes", False))
+        # Read on every query; mirrors config so lookups skip the mapping
+        self._match_punctuation: bool = bool(config.get("match_punctuation", True))
         # Base filename (used to derive _true / _false variants)
         self._base_cache_path: Path = Path(config.get("db_filename", "qa_cache.json"))
         if not self._base_cache_path.is_absolute():
             # Put DB inside integration folder by default
             self._base_cache_path = Path(__file__).parent / self._base_cache_path
-        # Ensure both variant files exist (create if missing) so toggling
-        # match_punctuation won't find missing files later. Create files
-        # conservatively only when they don't exist.
-        try:
-            default_payload = json.dumps({"version": 1, "items": []}, ensure_ascii=False, indent=2)
-            for m in (True, False):
-                p = self._cache_filename_for(m)
-                try:
-                    self._ensure_parent(p)
-                    if not p.exists():
-                        # write atomically to avoid partial files
-                        self._atomic_write(default_payload, path=p)
-                except Exception:
-                    # best-effort: skip creation on failure
-                    continue
-        except Exception:
-            pass
         self._ollama_url: str = config.get("ollama_base_url", "http://127.0.0.1:11434")
         self._model: str = config.get("model", "llama3")
         self._system_prompt: str = config.get("system_prompt", "")
@@ -77,7 +339,39 @@ class LLMCachedAgent(AbstractConversationAgent):
         self._repeat_penalty: float = float(config.get("repeat_penalty", 1.1))
         self._min_p: float = float(config.get("min_p", 0.0))
         self._seed: int = int(config.get("seed", -1))
-        self._io_lock = asyncio.Lock()
+        # Upper bound on cached entries (0 = unlimited)
+        self._max_entries: int = int(config.get("max_entries", 10000))
+        # Entries older than this are treated as misses (0 = never expire)
+        self._ttl_s: float = float(config.get("cache_ttl_days", 7)) * 86400
+        # Semantic lookup: empty model name disables it
+        self._embedding_model: str = config.get("embedding_model", "")
+        self._semantic_threshold: float = float(config.get("semantic_threshold", 0.9))
+        self._emb_index: _EmbeddingIndex | None = None
+        # Punctuation-stripped form (of each key and alias) -> entry keys in
+        # cache order, so punctuation-insensitive lookups are one dict probe,
+        # not a scan. Several keys can share a form (toggle merges, key
+        # migrations); dropping one leaves the others reachable.
+        self._stripped_index: dict[str, list[str]] = {}
+        # HTTP session to Ollama, created on first use and reused (keep-alive)
+        self._session: aiohttp.ClientSession | None = None
+        self._embed_timeout: aiohttp.ClientTimeout | None = None
+        # Single writer task that owns all cache file I/O: it drains queued
+        # records to the journal and runs queued file operations in order.
+        self._write_queue: asyncio.Queue[dict[str, Any] | Callable[[], None]] = asyncio.Queue()
+        self._writer_task: asyncio.Task[None] | None = None
+        # Executor job writing the current batch; file operations must not
+        # overlap, so a drain outside the writer waits for it first
+        self._drain_future: asyncio.Future[None] | None = None
+        # Set to make the writer skip the debounce delay (file operations,
+        # shutdown and callers waiting for their records to be on disk).
+        self._flush_now = asyncio.Event()
+        # include_datetime: resolved timezone and the last string formatted,
+        # reused while the configured zone and the current second match
+        self._tz: tzinfo = timezone.utc
+        self._tz_name: str | None = ""
+        self._dt_second = -1
+        self._dt_string = ""
+        self._rebuild_request_template()
 
     @property
     def supported_languages(self) -> list[str] | str:
@@ -85,12 +379,43 @@ class LLMCachedAgent(AbstractConversationAgent):
         return "*"
 
     async def async_prepare(self, language: str | None = None) -> None:
-        await self.hass.async_add_executor_job(self._load_cache)
+        await self._run_in_writer(self._load_cache)
 
     async def async_reload(self, language: str | None = None) -> None:
-        await self.hass.async_add_executor_job(self._load_cache)
+        await self._run_in_writer(self._load_cache)
+
+    async def async_will_remove(self) -> None:
+        """Release resources held by the agent when the entry is unloaded."""
+        if self._writer_task is not None:
+            # Let queued records reach the disk before stopping the writer
+            await self.async_flush(durable=True)
+            self._writer_task.cancel()
+            self._writer_task = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
-    async def async_update_config(self, config: dict[str, Any]) -> None:
+    async def async_flush(self, durable: bool = False) -> None:
+        """Write queued records now instead of after the debounce delay.
+
+        With durable=True the active cache files are also fsynced, which
+        non-durable writes skip.
+        """
+        self._flush_now.set()
+        task = self._writer_task
+        if task is not None and (task.cancelled() or task.cancelling()):
+            # Home Assistant cancels background tasks before
+            # EVENT_HOMEASSISTANT_STOP: let the writer finish the batch it
+            # took, then write what is left from here, in queue order
+            await asyncio.wait((task,))
+            await self._drain_queue()
+        else:
+            self._ensure_writer()
+        await self._write_queue.join()
+        if durable and not self._durable_writes:
+            await self._run_in_writer(self._sync_files)
+
+    async def async_update_config(self, config: Mapping[str, Any]) -> None:
         """Apply new configuration at runtime and refresh cache path if changed."""
         # If the only changed option is `match_punctuation`, avoid any
         # path/model updates or writes: just update config in memory and
@@ -107,23 +432,27 @@ class LLMCachedAgent(AbstractConversationAgent):
             # file so toggling does not lose existing entries.
             prev_path = self._cache_filename_for(prev_match)
             new_path = self._cache_filename_for(new_match)
-            # Acquire IO lock to avoid races with concurrent saves/alias-updates
-            # while we merge and reload cache files.
-            async with self._io_lock:
-                # Perform merge on executor to avoid blocking the event loop
-                await self.hass.async_add_executor_job(self._merge_cache_files, prev_path, new_path)
-                # Touch/read both variant files on the executor to ensure they
-                # are readable and not corrupted (best-effort). This helps
-                # avoid later surprises when the active file is read/written.
-                await self.hass.async_add_executor_job(self._read_json_tolerant, prev_path)
-                await self.hass.async_add_executor_job(self._read_json_tolerant, new_path)
-                # Update runtime config and reload the active cache
-                self.config = config
-                await self.hass.async_add_executor_job(self._load_cache)
+            # All file work runs on the writer task, after any records still
+            # queued, so it cannot interleave with concurrent saves/alias-updates.
+            # Let queued records land in the previous variant first.
+            await self.async_flush()
+            # The in-memory cache already holds every entry of the previous
+            # variant, so the merge uses it instead of re-reading that file.
+            # No await between the snapshot and the config update.
+            src_items = list(self._cache.values())
+            # Update runtime config, then merge and reload the active cache
+            self.config = config
+            self._match_punctuation = new_match
+            await self._run_in_writer(
+                partial(self._switch_variant, prev_path, new_path, src_items)
+            )
             return
 
+        # Let queued records land in the current file before the path may change
+        await self.async_flush()
         # Update config in memory for other changes
         self.config = config
+        self._match_punctuation = new_match
 
         # Otherwise, proceed to update derived fields and potentially change path
         self._ollama_url = config.get("ollama_base_url", self._ollama_url)
@@ -135,6 +464,12 @@ class LLMCachedAgent(AbstractConversationAgent):
         self._repeat_penalty = float(config.get("repeat_penalty", self._repeat_penalty))
         self._min_p = float(config.get("min_p", self._min_p))
         self._seed = int(config.get("seed", self._seed))
+        self._max_entries = int(config.get("max_entries", self._max_entries))
+        self._ttl_s = float(config.get("cache_ttl_days", self._ttl_s / 86400)) * 86400
+        self._durable_writes = bool(config.get("durable_writes", self._durable_writes))
+        self._embedding_model = config.get("embedding_model", self._embedding_model)
+        self._semantic_threshold = float(config.get("semantic_threshold", self._semantic_threshold))
+        self._rebuild_request_template()
         new_path_cfg = config.get("db_filename", self._base_cache_path.name)
         new_path = Path(new_path_cfg)
         if not new_path.is_absolute():
@@ -144,7 +479,7 @@ class LLMCachedAgent(AbstractConversationAgent):
         if path_changed:
             self._base_cache_path = new_path
         # Reload cache contents (safe even if same path)
-        await self.hass.async_add_executor_job(self._load_cache)
+        await self._run_in_writer(self._load_cache)
 
     def _cache_filename_for(self, match: bool) -> Path:
         """Return the cache Path for the given match_punctuation value.
@@ -167,37 +502,75 @@ class LLMCachedAgent(AbstractConversationAgent):
     def _read_json_tolerant(self, path: Path) -> dict[str, Any] | None:
         """Read JSON from path, tolerant to trailing NULs/garbage.
 
-        Returns None if unrecoverable.
+        The file is memory-mapped and parsed in place, so large caches are
+        not copied into a bytes object first. Returns None if unrecoverable.
         """
         try:
-            raw = path.read_bytes()
+            f = open(path, "rb")
         except FileNotFoundError:
-            return {"version": 1, "items": []}
+            return {"version": _CACHE_VERSION, "items": []}
         except Exception:
             return None
+        with f:
+            try:
+                if not os.fstat(f.fileno()).st_size:
+                    return {"version": _CACHE_VERSION, "items": []}
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except Exception:
+                return None
+            try:
+                return self._parse_json_tolerant(mm)
+            finally:
+                mm.close()
 
-        # Strip trailing NULs and whitespace
-        stripped = raw.rstrip(b"\x00\r\n\t ")
-        if not stripped:
-            return {"version": 1, "items": []}
-        try:
-            return json.loads(stripped.decode("utf-8"))
-        except Exception:
-            # Try to cut to last closing curly brace
+    def _parse_json_tolerant(self, mm: mmap.mmap) -> dict[str, Any] | None:
+        # Skip trailing NULs and whitespace without copying the buffer
+        end = len(mm)
+        while end and mm[end - 1] in b"\x00\r\n\t ":
+            end -= 1
+        if not end:
+            return {"version": _CACHE_VERSION, "items": []}
+        # Views must be released before the map is closed by the caller
+        with memoryview(mm) as mv:
             try:
-                txt = stripped.decode("utf-8", errors="ignore")
-                last = txt.rfind("}")
-                if last != -1:
-                    return json.loads(txt[: last + 1])
+                with mv[:end] as view:
+                    # orjson parses the mapped bytes directly
+                    return _json_loads(view)
             except Exception:
+                pass
+            # Try to cut to last closing curly brace (C-level scan on the map)
+            last = mm.rfind(b"}", 0, end)
+            if last == -1:
                 return None
-        return None
+            with mv[: last + 1] as view:
+                try:
+                    return _json_loads(view)
+                except Exception:
+                    pass
+                try:
+                    # Last resort: drop invalid UTF-8 sequences
+                    return _json_loads(bytes(view).decode("utf-8", errors="ignore"))
+                except Exception:
+                    return None
 
-    def _merge_cache_files(self, src: Path, dst: Path) -> None:
+    def _switch_variant(self, src: Path, dst: Path, src_items: list[CacheItem] | None = None) -> None:
+        """Merge the previous variant into the new one and load it."""
+        result = self._merge_cache_files(src, dst, src_items)
+        # _load_cache tolerates missing/corrupt files, so no separate sanity
+        # read is needed; skip even the load when the new variant has no files
+        if result == "merged" or dst.exists() or self._journal_path_for(dst).exists():
+            self._load_cache()
+        else:
+            self._clear_cache()
+
+    def _merge_cache_files(self, src: Path, dst: Path, src_items: list[CacheItem] | None = None) -> str:
         """Merge entries from src into dst without duplicating q_norm.
 
         If dst doesn't exist, it will be created as a copy of src. If it exists,
         entries from src that don't have a matching q_norm in dst will be appended.
+        When src_items is given (the cache loaded from src), src is not read.
+        Returns "merged" when dst was written, "noop" when there was nothing
+        to add and "failed" when a file could not be read or written.
         """
         try:
             self._ensure_parent(dst)
@@ -214,9 +587,9 @@ class LLMCachedAgent(AbstractConversationAgent):
                         self._ensure_parent(bak)
                         bak.write_bytes(dst.read_bytes())
                     except Exception:
-                        # As fallback, attempt atomic text write
+                        # As fallback, attempt atomic write
                         try:
-                            payload = dst.read_text(encoding="utf-8", errors="ignore")
+                            payload = dst.read_bytes()
                             self._ensure_parent(bak)
                             self._atomic_write(payload, path=bak)
                         except Exception:
@@ -225,20 +598,27 @@ class LLMCachedAgent(AbstractConversationAgent):
                 # If backup cannot be created, continue — merge is best-effort
                 pass
 
-            src_data = self._read_json_tolerant(src)
-            if not src_data:
-                return
+            if src_items is not None:
+                src_records = [ci.as_dict() for ci in src_items]
+                src_version = _CACHE_VERSION
+            else:
+                src_data = self._read_json_tolerant(src)
+                if src_data is None:
+                    return "failed"
+                src_records = src_data.get("items", [])
+                src_version = src_data.get("version", 1)
+            if not src_records:
+                return "noop"
             dst_data = self._read_json_tolerant(dst)
             if dst_data is None:
                 # If dst is unreadable, skip merge to avoid data loss
-                return
+                return "failed"
 
-            src_items = src_data.get("items", [])
             dst_items = dst_data.get("items", [])
             existing_qnorms = {item.get("q_norm") for item in dst_items if item.get("q_norm")}
 
             appended = False
-            for item in src_items:
+            for item in src_records:
                 qn = item.get("q_norm")
                 if not qn:
                     continue
@@ -248,14 +628,19 @@ class LLMCachedAgent(AbstractConversationAgent):
                 appended = True
 
             if appended:
-                payload = json.dumps({"version": 1, "items": dst_items}, ensure_ascii=False, indent=2)
+                # Items read from an older file keep their old keys, so the
+                # result is only as current as the oldest input
+                version = min(dst_data.get("version", 1), src_version)
+                payload = _dump_snapshot(dst_items, version)
                 # ensure parent exists
                 self._ensure_parent(dst)
                 # write to dst atomically
                 self._atomic_write(payload, path=dst)
+                return "merged"
+            return "noop"
         except Exception:
             # don't raise — merging is best-effort
-            return
+            return "failed"
 
     def _ensure_parent(self, path: Path) -> None:
         try:
@@ -263,55 +648,325 @@ class LLMCachedAgent(AbstractConversationAgent):
         except Exception:
             pass
 
+    def _journal_path_for(self, path: Path) -> Path:
+        """Return the append-only journal that sits next to a cache snapshot."""
+        return path.with_suffix(".jsonl")
+
     def _load_cache(self) -> None:
-        # Protected by lock at call sites via executor serialization
+        # Runs on the writer task (see _run_in_writer), serialized with writes
         try:
             path = self._active_cache_path()
             self._ensure_parent(path)
-            # If file doesn't exist yet, don't create/overwrite it here; keep cache empty
-            if not path.exists():
-                self._cache = {}
+            journal = self._journal_path_for(path)
+            # If no file exists yet, don't create/overwrite it here; keep cache empty
+            if not path.exists() and not journal.exists():
+                self._clear_cache()
                 return
 
-            data = self._read_json_tolerant(path)
-            # If reading failed unrecoverably, keep existing cache and do not overwrite file
-            if data is None:
-                return
-            self._cache = {
-                item.get("q_norm", ""): CacheItem(
-                    q=item.get("q", ""),
-                    q_norm=item.get("q_norm", ""),
-                    a=item.get("a", ""),
-                    ts=item.get("ts", ""),
-                    aliases=item.get("aliases", []) or [],
-                )
-                for item in data.get("items", [])
-                if item.get("q_norm")
-            }
+            loaded = None
+            if path.exists() and path.stat().st_size > _STREAM_THRESHOLD:
+                loaded = self._stream_snapshot(path)
+            if loaded is None:
+                data = self._read_json_tolerant(path)
+                # If reading failed unrecoverably, keep existing cache and do not overwrite file
+                if data is None:
+                    return
+                loaded = data.get("version", 1), self._items_to_cache(data.get("items", ()))
+            version, cache = loaded
+            # Apply entries appended since the last compaction (last write wins)
+            self._appended_count, self._journal_bytes = self._replay_journal(journal, cache)
+            self._snapshot_bytes = path.stat().st_size if path.exists() else 0
+            # Re-key entries written before the current normalize()
+            migrated = version < _CACHE_VERSION
+            if migrated:
+                cache = self._renormalize(cache)
+            # Honour a max_entries lowered since the cache was written
+            if self._max_entries > 0:
+                while len(cache) > self._max_entries:
+                    cache.popitem(last=False)
+            # Build the indexes first so the swap below is a few assignments
+            emb_index = self._build_emb_index(cache)
+            stripped_index = self._build_stripped_index(cache)
+            self._swap_cache(cache, emb_index, stripped_index)
+            # Fold a long journal left by the previous run into the snapshot;
+            # after a migration always, so old keys are not replayed again
+            if migrated or self._should_compact():
+                self._compact()
         except Exception:
             # Keep running even if DB is malformed
-            self._cache = {}
+            self._swap_cache(OrderedDict(), None, {})
+
+    def _clear_cache(self) -> None:
+        """Reset to an empty cache for a variant with no files yet."""
+        self._swap_cache(OrderedDict(), None, {})
+        self._appended_count = 0
+        self._journal_bytes = 0
+        self._snapshot_bytes = 0
+
+    def _swap_cache(
+        self,
+        cache: OrderedDict[str, CacheItem],
+        emb_index: _EmbeddingIndex | None,
+        stripped_index: dict[str, list[str]],
+    ) -> None:
+        """Install a cache and its indexes on the event loop and wait for it.
+
+        Called from the writer's executor thread. Swapping on the loop means a
+        lookup there never sees the cache change under it between two
+        statements; work after this call (compaction) sees the new cache.
+        """
+        run_callback_threadsafe(
+            self.hass.loop, self._set_cache, cache, emb_index, stripped_index
+        ).result()
+
+    @callback
+    def _set_cache(
+        self,
+        cache: OrderedDict[str, CacheItem],
+        emb_index: _EmbeddingIndex | None,
+        stripped_index: dict[str, list[str]],
+    ) -> None:
+        self._cache = cache
+        self._emb_index = emb_index
+        self._stripped_index = stripped_index
+
+    def _stream_snapshot(self, path: Path) -> tuple[int, OrderedDict[str, CacheItem]] | None:
+        """Load a snapshot written by _dump_snapshot one line at a time.
+
+        Returns (version, cache), or None when the file has another layout
+        (hand-edited, older or damaged) so the caller parses it whole.
+        """
+        try:
+            with open(path, "rb") as f:
+                head = _SNAPSHOT_HEAD_RE.fullmatch(f.readline().rstrip())
+                if head is None:
+                    return None
+
+                def items() -> Any:
+                    for line in f:
+                        line = line.rstrip()
+                        if line == b"]}":
+                            return
+                        yield _json_loads(line[:-1] if line.endswith(b",") else line)
+                    raise ValueError("snapshot ends before its closing bracket")
+
+                return int(head.group(1)), self._items_to_cache(items())
+        except Exception:
+            return None
+
+    def _items_to_cache(self, items: Any) -> OrderedDict[str, CacheItem]:
+        """Build the cache from snapshot items.
+
+        Runs once per item at startup, so lookups are bound to locals and
+        well-formed items use direct subscripts instead of repeated .get().
+        """
+        cache: OrderedDict[str, CacheItem] = OrderedDict()
+        setitem = cache.__setitem__
+        intern = sys.intern
+        parse_ts = _parse_ts
+        for item in items:
+            qn = item.get("q_norm")
+            if not qn:
+                continue
+            try:
+                ci = CacheItem(
+                    item["q"],
+                    intern(qn),
+                    item["a"],
+                    parse_ts(item["ts"]),
+                    item.get("aliases") or [],
+                    item.get("emb") or "",
+                )
+            except KeyError:
+                # Hand-edited or very old entry: fill in defaults
+                ci = _item_from_dict(item)
+            setitem(ci.q_norm, ci)
+        return cache
+
+    def _replay_journal(self, journal: Path, cache: OrderedDict[str, CacheItem]) -> tuple[int, int]:
+        """Apply journal records to cache.
+
+        Returns (records read, journal size in bytes). Unparseable lines
+        (e.g. a record truncated by a crash) are skipped.
+        """
+        try:
+            raw = journal.read_bytes()
+        except OSError:
+            return 0, 0
+        # Padding from a crash can only trail the last record: find the real
+        # end once instead of rstrip()-copying every line
+        end = len(raw)
+        while end and raw[end - 1] in b"\x00\r\n\t ":
+            end -= 1
+        count = 0
+        with memoryview(raw) as mv:
+            start = 0
+            while start < end:
+                nl = raw.find(b"\n", start, end)
+                if nl == -1:
+                    nl = end
+                line_start, start = start, nl + 1
+                if nl == line_start:
+                    continue
+                try:
+                    # Parsed in place from the view; JSON ignores the "\r"
+                    # of CRLF line ends
+                    with mv[line_start:nl] as line:
+                        item = _json_loads(line)
+                except Exception:
+                    continue
+                count += 1
+                qn = item.get("q_norm")
+                if not qn:
+                    continue
+                if item.get("deleted"):
+                    # Tombstone written when the entry was evicted
+                    cache.pop(qn, None)
+                    continue
+                ci = _item_from_dict(item)
+                cache[ci.q_norm] = ci
+                cache.move_to_end(ci.q_norm)
+        return count, len(raw)
 
-    def _atomic_write(self, text: str, path: Path | None = None) -> None:
-        """Atomically write text to cache file to avoid truncation/corruption."""
+    @staticmethod
+    def _renormalize(cache: OrderedDict[str, CacheItem]) -> OrderedDict[str, CacheItem]:
+        """Re-key entries with the current normalize().
+
+        Entries whose keys now collide are merged: the first one is kept and
+        the others' aliases are added to it.
+        """
+        migrated: OrderedDict[str, CacheItem] = OrderedDict()
+        for key, ci in cache.items():
+            new_key = sys.intern(normalize(key))
+            aliases = [normalize(alias) for alias in ci.aliases]
+            target = migrated.get(new_key)
+            if target is None:
+                ci.q_norm = new_key
+                ci.aliases = []
+                migrated[new_key] = target = ci
+            for alias in aliases:
+                if alias != new_key and alias not in target.aliases:
+                    target.aliases.append(alias)
+        return migrated
+
+    @staticmethod
+    def _build_stripped_index(cache: OrderedDict[str, CacheItem]) -> dict[str, list[str]]:
+        """Map the stripped form of every key and alias to its entry keys.
+
+        Keys are listed in cache order, so the first one is the entry the old
+        linear scan found.
+        """
+        index: dict[str, list[str]] = {}
+        setdefault = index.setdefault
+        strip = _strip_punctuation
+        for key, ci in cache.items():
+            ci.stripped = strip(key)
+            ci.stripped_aliases = [strip(alias) for alias in ci.aliases]
+            for form_cmp in (ci.stripped, *ci.stripped_aliases):
+                keys = setdefault(form_cmp, [])
+                if not keys or keys[-1] != key:
+                    keys.append(key)
+        return index
+
+    def _semantic_enabled(self) -> bool:
+        return np is not None and bool(self._embedding_model)
+
+    def _build_emb_index(self, cache: OrderedDict[str, CacheItem]) -> _EmbeddingIndex | None:
+        """Build the embedding matrix from the stored per-item embeddings."""
+        if not self._semantic_enabled():
+            return None
+        index = _EmbeddingIndex()
+        for key, ci in cache.items():
+            if not ci.emb:
+                continue
+            try:
+                index.add(key, _decode_embedding(ci.emb))
+            except Exception:
+                continue
+        return index
+
+    def _atomic_write(self, payload: bytes, path: Path | None = None) -> None:
+        """Atomically write payload to cache file to avoid truncation/corruption."""
         try:
             # Use explicit path passed via callers (use _active_cache_path when needed)
             # Caller should ensure parent exists.
             target = path or self._active_cache_path()
             tmp_path = target.with_suffix(target.suffix + ".tmp")
-            with open(tmp_path, "w", encoding="utf-8") as f:
-                f.write(text)
-                f.flush()
-                os.fsync(f.fileno())
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+                if self._durable_writes:
+                    f.flush()
+                    _fsync(f.fileno())
+            # Still atomic for readers; only crash durability needs the fsyncs
             os.replace(tmp_path, target)
+            if self._durable_writes:
+                # Without this the rename itself may be lost on power failure
+                _fsync_dir(target.parent)
         except Exception:
             # As last resort, try simple write (may still fail)
             try:
-                (path or self._active_cache_path()).write_text(text, encoding="utf-8")
+                (path or self._active_cache_path()).write_bytes(payload)
             except Exception:
                 pass
 
-    def _save_cache(self) -> None:
+    def _append_records(self, records: list[dict[str, Any]]) -> None:
+        """Append records to the active journal (one fsync with durable_writes).
+
+        Each insert costs one short write instead of rewriting the whole
+        snapshot; the journal is folded back once _should_compact() says so.
+        """
+        try:
+            active = self._active_cache_path()
+            journal = self._journal_path_for(active)
+            self._ensure_parent(journal)
+            created = not journal.exists()
+            payload = b"".join(_json_dumps(record) + b"\n" for record in records)
+            with open(journal, "ab") as f:
+                f.write(payload)
+                if self._durable_writes:
+                    f.flush()
+                    _fsync(f.fileno())
+            if created and self._durable_writes:
+                _fsync_dir(journal.parent)
+            self._appended_count += len(records)
+            self._journal_bytes += len(payload)
+            if self._should_compact():
+                self._compact()
+        except Exception:
+            pass
+
+    def _sync_files(self) -> None:
+        """fsync the active snapshot and journal left unsynced by non-durable writes."""
+        active = self._active_cache_path()
+        for path in (active, self._journal_path_for(active)):
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                _fsync(fd)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+        _fsync_dir(active.parent)
+
+    def _should_compact(self) -> bool:
+        """Whether the journal should be folded into the snapshot.
+
+        Either the journal is mostly superseded records (more than twice the
+        live entries), or, past a small floor, it has grown larger than the
+        snapshot. The size rule makes the snapshot roughly double between
+        rewrites, so compaction stays amortized O(1) per insert.
+        """
+        if not self._appended_count:
+            return False
+        if self._appended_count > 2 * len(self._cache):
+            return True
+        return self._appended_count >= 64 and self._journal_bytes > self._snapshot_bytes
+
+    def _compact(self) -> None:
+        """Rewrite the active snapshot from memory and drop its journal."""
         try:
             # Do not overwrite the on-disk DB with an empty list if the
             # in-memory cache is empty. This prevents accidental resets
@@ -320,9 +975,12 @@ class LLMCachedAgent(AbstractConversationAgent):
             if not self._cache:
                 return
 
-            items = [vars(ci) for ci in self._cache.values()]
-            data = {"version": 1, "items": items}
-            payload = json.dumps(data, ensure_ascii=False, indent=2)
+            # Copy under the lock so event-loop inserts cannot change the
+            # dict under this (executor) iteration; serialize outside it.
+            with self._cache_lock:
+                values = list(self._cache.values())
+            items = [ci.as_dict() for ci in values]
+            payload = _dump_snapshot(items)
             # ensure parent exists for active path
             active = self._active_cache_path()
             self._ensure_parent(active)
@@ -330,121 +988,332 @@ class LLMCachedAgent(AbstractConversationAgent):
             # could change between computing `active` and performing the
             # atomic write (for example due to concurrent config toggles).
             self._atomic_write(payload, path=active)
+            # The snapshot now contains every journaled record; replaying a
+            # journal left behind by a crash before unlink is harmless.
+            self._journal_path_for(active).unlink(missing_ok=True)
+            self._appended_count = 0
+            self._journal_bytes = 0
+            self._snapshot_bytes = len(payload)
         except Exception:
             pass
 
     async def async_process(self, user_input: ConversationInput) -> ConversationResult:
         q = user_input.text
-        qn = normalize(q)
-        # Whether to require punctuation to match. Default True to preserve
-        # existing behaviour (exact punctuation match).
-        match_punctuation = bool(self.config.get("match_punctuation", True))
-
-        # 1) Cache
-        if match_punctuation:
-            # Require exact normalized match (including punctuation)
-            if qn in self._cache:
-                resp = intent.IntentResponse(language=user_input.language)
-                resp.async_set_speech(self._cache[qn].a)
-                return ConversationResult(response=resp, conversation_id=user_input.conversation_id)
-        else:
-            # When ignoring punctuation, prefer exact match but fall back
-            # to punctuation-insensitive comparison (including aliases).
-            if qn in self._cache:
-                resp = intent.IntentResponse(language=user_input.language)
-                resp.async_set_speech(self._cache[qn].a)
-                return ConversationResult(response=resp, conversation_id=user_input.conversation_id)
+        qn = _normalize_cached(q)
+        # Cache as a local. Only valid until the first await: the cache is
+        # swapped on the event loop, so a reload may replace it while the
+        # LLM is answering.
+        cache = self._cache
 
+        # 1) Cache: an exact normalized match is a hit in both modes, so
+        # check it before anything else
+        hit = self._fresh(qn)
+        if hit is not None:
+            cache.move_to_end(qn)
+            return _speech_result(user_input, hit.a)
+
+        # Stripped form of the query; stays None when punctuation must match
+        # (match_punctuation, the default)
+        qn_cmp: str | None = None
+        if not self._match_punctuation:
+            # When ignoring punctuation, fall back to punctuation-insensitive
+            # comparison (primary form or aliases).
             qn_cmp = _strip_punctuation(qn)
-            found_key: str | None = None
-            found: CacheItem | None = None
-            for k, ci in self._cache.items():
-                # check primary normalized form
-                if _strip_punctuation(ci.q_norm) == qn_cmp:
-                    found_key = k
-                    found = ci
-                    break
-                # check aliases
-                for alias in (ci.aliases or []):
-                    if _strip_punctuation(alias) == qn_cmp:
-                        found_key = k
-                        found = ci
-                        break
-                if found:
-                    break
+            found_key, found = self._find_stripped(qn_cmp)
+            while found is not None and self._expired(found):
+                # Stale answer: forget it and try the next entry with this
+                # stripped form, if any
+                self._drop(found_key)
+                found_key, found = self._find_stripped(qn_cmp)
             if found:
+                if found_key in cache:
+                    cache.move_to_end(found_key)
                 # If the normalized form isn't recorded yet as primary or alias,
                 # and match_punctuation is False, add it to aliases and save,
                 # but do NOT change the stored answer.
                 if qn != found.q_norm and qn not in (found.aliases or []):
-                    async with self._io_lock:
-                        # reload reference in case of race
-                        if found_key is not None:
-                            key = found_key
-                            ci = self._cache.get(key)
-                            if ci is not None:
-                                if qn != ci.q_norm and qn not in (ci.aliases or []):
-                                    ci.aliases.append(qn)
-                                    self._cache[key] = ci
-                                    await self.hass.async_add_executor_job(self._save_cache)
-
-                resp = intent.IntentResponse(language=user_input.language)
-                resp.async_set_speech(found.a)
-                return ConversationResult(response=resp, conversation_id=user_input.conversation_id)
+                    found.aliases.append(qn)
+                    found.stripped_aliases.append(qn_cmp)
+                    # Housekeeping only: the writer task persists the alias
+                    # in the background, the answer does not wait for it
+                    self._enqueue_write(found.as_dict())
+
+                return _speech_result(user_input, found.a)
+
+        # 1b) Semantic lookup: embed the query once and compare it against
+        # all cached embeddings with a single matrix-vector product.
+        q_vec = None
+        if self._semantic_enabled():
+            q_vec = await self._embed(q)
+            index = self._emb_index
+            if q_vec is not None and index is not None:
+                key, score = index.best(q_vec)
+                ci = self._fresh(key) if key is not None else None
+                if ci is not None and score >= self._semantic_threshold:
+                    self._cache.move_to_end(key)
+                    return _speech_result(user_input, ci.a)
 
         # 2) Fallback to LLM via Ollama
         answer = await self._ask_llm(q)
 
         if answer:
-            # 3) Save to cache (guarded by lock)
-            now = datetime.now(timezone.utc).isoformat()
-            async with self._io_lock:
-                if match_punctuation:
-                    # When punctuation matching is required, always create a
-                    # new record for this exact normalized form (do not merge
-                    # with stripped matches or aliases).
-                    self._cache[qn] = CacheItem(q=q, q_norm=qn, a=answer, ts=now, aliases=[])
+            # 3) Save to cache; the writer task persists records in the
+            # order they are queued.
+            changed = self._commit(q, qn, qn_cmp, answer, q_vec)
+            if changed is not None:
+                # Persist through the writer task so the answer is
+                # returned without waiting on the disk write.
+                self._enqueue_write(changed.as_dict())
+                self._evict_overflow()
+
+        return _speech_result(user_input, answer or "Mi dispiace, non ho trovato una risposta.")
+
+    def _find_stripped(self, qn_cmp: str) -> tuple[str | None, CacheItem | None]:
+        """Return (key, entry) whose key or an alias strips to qn_cmp."""
+        keys = self._stripped_index.get(qn_cmp)
+        if not keys:
+            return None, None
+        key = keys[0]
+        ci = self._cache.get(key)
+        return (key, ci) if ci is not None else (None, None)
+
+    def _commit(
+        self, q: str, qn: str, qn_cmp: str | None, answer: str, q_vec: Any
+    ) -> CacheItem | None:
+        """Store a new answer; return the entry to persist, if any changed.
+
+        qn_cmp is the stripped query computed by the lookup, or None when
+        punctuation must match.
+        """
+        now = time.time()
+        changed: CacheItem | None = None
+        with self._cache_lock:
+            if qn_cmp is None:
+                # When punctuation matching is required, always create a
+                # new record for this exact normalized form (do not merge
+                # with stripped matches or aliases).
+                changed = self._new_item(q, qn, answer, now, q_vec)
+                self._cache[qn] = changed
+            else:
+                # When ignoring punctuation, check again for an existing
+                # stripped match (another query may have stored one while
+                # the LLM answered). If found, add qn as alias if missing
+                # but DO NOT overwrite the stored answer.
+                _, ci = self._find_stripped(qn_cmp)
+
+                if ci is not None:
+                    if qn != ci.q_norm and qn not in (ci.aliases or []):
+                        ci.aliases.append(qn)
+                        ci.stripped_aliases.append(qn_cmp)
+                        changed = ci
+                    # Do NOT change ci.a or ci.ts when merging aliases
                 else:
-                    # When ignoring punctuation, check again for an existing
-                    # stripped match. If found, add qn as alias if missing
-                    # but DO NOT overwrite the stored answer.
-                    qn_cmp = _strip_punctuation(qn)
-                    existing_key: str | None = None
-                    for k, ci in self._cache.items():
-                        if _strip_punctuation(ci.q_norm) == qn_cmp:
-                            existing_key = k
-                            break
-                        for alias in (ci.aliases or []):
-                            if _strip_punctuation(alias) == qn_cmp:
-                                existing_key = k
-                                break
-                        if existing_key:
-                            break
-
-                    if existing_key is not None:
-                        ci = self._cache[existing_key]
-                        if qn != ci.q_norm and qn not in (ci.aliases or []):
-                            ci.aliases.append(qn)
-                            self._cache[existing_key] = ci
-                        # Do NOT change ci.a or ci.ts when merging aliases
-                    else:
-                        # No similar entry: create new record
-                        self._cache[qn] = CacheItem(q=q, q_norm=qn, a=answer, ts=now, aliases=[])
-
-                await self.hass.async_add_executor_job(self._save_cache)
-
-        resp = intent.IntentResponse(language=user_input.language)
-        resp.async_set_speech(answer or "Mi dispiace, non ho trovato una risposta.")
-        return ConversationResult(response=resp, conversation_id=user_input.conversation_id)
+                    # No similar entry: create new record
+                    changed = self._new_item(q, qn, answer, now, q_vec)
+                    self._cache[qn] = changed
+        return changed
 
-    async def _ask_llm(self, prompt: str) -> str | None:
-        # For now, use Ollama generate API as the LLM backend
+    def _enqueue_write(self, record: dict[str, Any]) -> None:
+        self._write_queue.put_nowait(record)
+        self._ensure_writer()
+
+    def _evict_overflow(self) -> None:
+        """Drop least recently used entries beyond max_entries."""
+        if self._max_entries <= 0:
+            return
+        while len(self._cache) > self._max_entries:
+            self._drop(next(iter(self._cache)))
+
+    def _expired(self, ci: CacheItem) -> bool:
+        return self._ttl_s > 0 and ci.ts > 0 and time.time() - ci.ts >= self._ttl_s
+
+    def _fresh(self, key: str) -> CacheItem | None:
+        """Return the entry for key unless it has outlived the TTL.
+
+        Expiry is checked lazily on lookup; an expired entry is dropped.
+        """
+        ci = self._cache.get(key)
+        if ci is not None and self._expired(ci):
+            self._drop(key)
+            return None
+        return ci
+
+    def _drop(self, key: str) -> None:
+        """Remove an entry from memory and record the removal in the journal."""
+        with self._cache_lock:
+            ci = self._cache.pop(key, None)
+            if ci is None:
+                return
+            if self._emb_index is not None:
+                self._emb_index.remove(key)
+            stripped = self._stripped_index
+            for form_cmp in (ci.stripped, *ci.stripped_aliases):
+                keys = stripped.get(form_cmp)
+                if keys is not None and key in keys:
+                    # Other entries with this form take over the slot
+                    keys.remove(key)
+                    if not keys:
+                        del stripped[form_cmp]
+        # Tombstone so the removal survives a restart; compaction drops it
+        self._enqueue_write({"q_norm": key, "deleted": True})
+
+    def _ensure_writer(self) -> None:
+        task = self._writer_task
+        # A cancelled writer stays down; async_flush drains the queue instead
+        if task is None or (task.done() and not task.cancelled()):
+            self._writer_task = self.hass.async_create_background_task(
+                self._writer_loop(), name="llm_cached_conversation_agent cache writer"
+            )
+
+    async def _writer_loop(self) -> None:
+        """Persist queued entries, batching whatever piled up into one executor job.
+
+        Records are debounced: the writer waits up to _FLUSH_DELAY for more to
+        arrive unless a flush is requested. File operations never wait.
+        """
+        queue = self._write_queue
+        flush_now = self._flush_now
+        while True:
+            batch = [await queue.get()]
+            try:
+                try:
+                    if isinstance(batch[0], dict) and not flush_now.is_set():
+                        try:
+                            await asyncio.wait_for(flush_now.wait(), _FLUSH_DELAY)
+                        except asyncio.TimeoutError:
+                            pass
+                finally:
+                    # Runs on cancellation too, so nothing taken is lost
+                    flush_now.clear()
+                    while not queue.empty():
+                        batch.append(queue.get_nowait())
+                    self._drain_future = self.hass.async_add_executor_job(self._drain, batch)
+                    # Acked only once written, even when cancelled meanwhile
+                    await _finish(self._drain_future)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _drain_queue(self) -> None:
+        """Write everything queued without going through the writer task."""
+        queue = self._write_queue
+        while (pending := self._drain_future) is not None and not pending.done():
+            await asyncio.wait((pending,))
+        batch: list[dict[str, Any] | Callable[[], None]] = []
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        if not batch:
+            return
+        self._drain_future = self.hass.async_add_executor_job(self._drain, batch)
+        try:
+            await _finish(self._drain_future)
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+    def _drain(self, batch: list[dict[str, Any] | Callable[[], None]]) -> None:
+        """Write a batch in queue order: consecutive records share one append."""
+        records: list[dict[str, Any]] = []
+        for entry in batch:
+            if isinstance(entry, dict):
+                records.append(entry)
+                continue
+            if records:
+                self._append_records(records)
+                records = []
+            try:
+                entry()
+            except Exception:
+                pass
+        if records:
+            self._append_records(records)
+
+    async def _run_in_writer(self, func: Callable[[], None]) -> None:
+        """Run a file operation on the writer task and wait for it."""
+        self._write_queue.put_nowait(func)
+        await self.async_flush()
+
+    def _new_item(self, q: str, qn: str, answer: str, ts: float, q_vec: Any) -> CacheItem:
+        """Create a cache record, registering it in the lookup indexes."""
+        stripped = _strip_punctuation(qn)
+        keys = self._stripped_index.setdefault(stripped, [])
+        if qn not in keys:
+            keys.append(qn)
+        emb = ""
+        if q_vec is not None:
+            emb = _encode_embedding(q_vec)
+            if self._emb_index is None:
+                self._emb_index = _EmbeddingIndex()
+            self._emb_index.add(qn, q_vec)
+        return CacheItem(q=q, q_norm=qn, a=answer, ts=ts, aliases=[], emb=emb, stripped=stripped)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the Ollama HTTP session, creating it on first use.
+
+        Generate and embed calls share its keep-alive connections; timeouts
+        are built once here instead of per request.
+        """
         import aiohttp  # type: ignore
 
-        url = f"{self._ollama_url.rstrip('/')}/api/generate"
-        # Build system prompt (optionally include current date/time)
-        system_prompt = self._system_prompt or ""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=60),
+                connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=60),
+            )
+            # Embedding runs before every LLM call, so it gives up sooner
+            self._embed_timeout = aiohttp.ClientTimeout(total=10)
+        return self._session
+
+    async def _embed(self, text: str) -> Any:
+        """Return the L2-normalized embedding of text via Ollama, or None."""
+        url = self._embed_url
+        payload = {"model": self._embedding_model, "input": text}
+        try:
+            session = self._get_session()
+            async with session.post(url, json=payload, timeout=self._embed_timeout) as r:
+                if r.status != 200:
+                    return None
+                data = await r.json()
+            vec = np.asarray(data["embeddings"][0], dtype=np.float32)
+            norm = float(np.linalg.norm(vec))
+            if not norm:
+                return None
+            return vec / norm
+        except Exception:
+            return None
+
+    def _rebuild_request_template(self) -> None:
+        """Precompute the parts of Ollama requests that only change with config."""
+        base = self._ollama_url.rstrip("/")
+        self._generate_url = f"{base}/api/generate"
+        self._embed_url = f"{base}/api/embed"
+        self._llm_options: dict[str, Any] = {
+            "top_p": self._top_p,
+            "top_k": self._top_k,
+            "repeat_penalty": self._repeat_penalty,
+            "min_p": self._min_p,
+            "seed": self._seed,
+        }
+        # Fields shared by every generate request; per call only the prompt
+        # (and a system prompt carrying the time) are added to a copy
+        self._llm_base: dict[str, Any] = {
+            "model": self._model,
+            # Stream NDJSON chunks so tokens are consumed as they are produced
+            # instead of buffering one large response body.
+            "stream": True,
+            "options": self._llm_options,
+        }
+        if self._system_prompt and not self._include_datetime:
+            # Ollama's generate API accepts a 'system' field to set a system prompt
+            self._llm_base["system"] = self._system_prompt
+
+    async def _ask_llm(self, prompt: str) -> str | None:
+        # For now, use Ollama generate API as the LLM backend
+        url = self._generate_url
+        payload = {**self._llm_base, "prompt": prompt}
         if self._include_datetime:
+            # Only the time-stamped system prompt has to be built per call
+            system_prompt = self._system_prompt or ""
             try:
                 dt = self._current_datetime_string()
                 extra = f"Current date/time: {dt}"
@@ -452,36 +1321,26 @@ class LLMCachedAgent(AbstractConversationAgent):
                 extra = None
             if extra:
                 system_prompt = (system_prompt + "\n\n" if system_prompt else "") + extra
-
-        payload = {
-            "model": self._model,
-            "prompt": prompt,
-            "stream": False,
-        }
-        if system_prompt:
-            # Ollama's generate API accepts a 'system' field to set a system prompt
-            payload["system"] = system_prompt
-        # Optional generation options
-        options: dict[str, Any] = {}
-        options["top_p"] = self._top_p
-        options["top_k"] = self._top_k
-        options["repeat_penalty"] = self._repeat_penalty
-        options["min_p"] = self._min_p
-        if self._seed is not None:
-            options["seed"] = self._seed
-        if options:
-            payload["options"] = options
+            if system_prompt:
+                payload["system"] = system_prompt
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=60),
-                ) as r:
-                    if r.status != 200:
+            session = self._get_session()
+            async with session.post(url, json=payload) as r:
+                if r.status != 200:
+                    return None
+                parts: list[str] = []
+                async for line in r.content:
+                    if not line.strip():
+                        continue
+                    chunk = _json_loads(line)
+                    if chunk.get("error"):
                         return None
-                    data = await r.json()
-                    return data.get("response")
+                    parts.append(chunk.get("response", ""))
+                    if chunk.get("done"):
+                        return "".join(parts) or None
+                # Stream ended before the final chunk: the answer may be
+                # truncated, so do not return (and cache) it
+                return None
         except Exception:
             return None
 
@@ -489,13 +1348,24 @@ class LLMCachedAgent(AbstractConversationAgent):
         """Return current date/time as ISO string with timezone info.
 
         Preference is the Home Assistant configured timezone; fallback to UTC.
+        The string only changes once per second, so it is formatted at most
+        once per second and the ZoneInfo only when the timezone changes.
         """
-        try:
-            tz_name = getattr(self.hass.config, "time_zone", None)
-            tz = ZoneInfo(tz_name) if tz_name else timezone.utc
-        except Exception:
-            tz = timezone.utc
-        now = datetime.now(tz).replace(microsecond=0)
+        tz_name = getattr(self.hass.config, "time_zone", None)
+        if tz_name != self._tz_name:
+            try:
+                self._tz = ZoneInfo(tz_name) if tz_name else timezone.utc
+            except Exception:
+                self._tz = timezone.utc
+            self._tz_name = tz_name
+            self._dt_second = -1
+        second = int(time.time())
+        if second == self._dt_second:
+            return self._dt_string
+        tz = self._tz
+        now = datetime.fromtimestamp(second, tz)
         # Example: 2025-08-19T14:22:05+02:00 (Europe/Rome)
         tz_label = getattr(tz, "key", None) or getattr(tz, "tzname", lambda *_: "")(now) or "UTC"
-        return f"{now.isoformat()} ({tz_label})"
+        self._dt_second = second
+        self._dt_string = f"{now.isoformat()} ({tz_label})"
+        return self._dt_string
@@ -38,6 +38,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional("db_filename", default="qa_cache.json"): str,
                 vol.Optional("match_punctuation", default=True): bool,
                 vol.Optional("include_datetime", default=False): bool,
+                vol.Optional("embedding_model", default=""): str,
+                vol.Optional("semantic_threshold", default=0.9): vol.Coerce(float),
+                vol.Optional("max_entries", default=10000): vol.Coerce(int),
+                vol.Optional("cache_ttl_days", default=7): vol.Coerce(float),
+                vol.Optional("durable_writes", default=False): bool,
             }
         )
         return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
@@ -67,6 +72,11 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Optional("db_filename", default=data.get("db_filename", "qa_cache.json")): str,
                 vol.Optional("match_punctuation", default=data.get("match_punctuation", True)): bool,
                 vol.Optional("include_datetime", default=data.get("include_datetime", False)): bool,
+                vol.Optional("embedding_model", default=data.get("embedding_model", "")): str,
+                vol.Optional("semantic_threshold", default=data.get("semantic_threshold", 0.9)): vol.Coerce(float),
+                vol.Optional("max_entries", default=data.get("max_entries", 10000)): vol.Coerce(int),
+                vol.Optional("cache_ttl_days", default=data.get("cache_ttl_days", 7)): vol.Coerce(float),
+                vol.Optional("durable_writes", default=data.get("durable_writes", False)): bool,
             }
         )
         return self.async_show_form(step_id="init", data_schema=schema)